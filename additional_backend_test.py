@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Additional Backend API Tests for Knowledge Base and Chat endpoints
+Additional Backend API Tests for Knowledge Base, Delete and Chat endpoints
 """
 
 import requests
@@ -180,6 +180,83 @@ class AdditionalAPITestSuite:
             else:
                 self.log_test("Knowledge File Deletion", False, "File deletion failed", result)
 
+    def scrape_page_for(self, token: str, customer_id: str) -> Optional[str]:
+        """Scrape a page for a customer and return the new scraped content ID"""
+        scrape_data = {
+            "customer_id": customer_id,
+            "urls": ["https://example.com"]
+        }
+        result = self.make_request("POST", "/scrape/manual", token=token, data=scrape_data)
+        if not result["success"]:
+            return None
+
+        result = self.make_request("GET", f"/scrape/content/{customer_id}", token=token)
+        if not result["success"] or not result["data"]:
+            return None
+        return result["data"][0].get("id")
+
+    def test_delete_endpoints(self):
+        """Test customer and scraped content deletion"""
+        print("\n=== Delete API Tests ===")
+        
+        if not self.admin_token or not self.customer_token or not self.customer_id:
+            self.log_test("Delete Setup", False, "Missing tokens or customer ID")
+            return
+        
+        # Create a throwaway customer to delete
+        customer_data = {
+            "name": "Delete Test Customer",
+            "webhook_url": "https://example.com/webhook"
+        }
+        result = self.make_request("POST", "/customers", token=self.admin_token, data=customer_data)
+        if not result["success"]:
+            self.log_test("Delete Test Customer Creation", False, "Failed to create customer", result)
+            return
+        other_customer_id = result["data"].get("id")
+        
+        # Test deleting another customer's scraped content
+        other_content_id = self.scrape_page_for(self.admin_token, other_customer_id)
+        if other_content_id:
+            result = self.make_request("DELETE", f"/scrape/content/{other_content_id}", token=self.customer_token, expected_status=403)
+            if result["success"]:
+                self.log_test("Scraped Content Delete Access Control", True, "Customer blocked from deleting other customer content")
+            else:
+                self.log_test("Scraped Content Delete Access Control", False, "Customer not properly blocked", result)
+        else:
+            self.log_test("Scraped Content Delete Access Control", False, "Failed to scrape page for other customer")
+        
+        # Test owner deleting own scraped content
+        own_content_id = self.scrape_page_for(self.customer_token, self.customer_id)
+        if own_content_id:
+            result = self.make_request("DELETE", f"/scrape/content/{own_content_id}", token=self.customer_token)
+            if result["success"]:
+                self.log_test("Scraped Content Deletion", True, "Owner deleted scraped content successfully")
+            else:
+                self.log_test("Scraped Content Deletion", False, "Scraped content deletion failed", result)
+        else:
+            self.log_test("Scraped Content Deletion", False, "Failed to scrape page for customer")
+        
+        # Test customer trying to delete a customer
+        result = self.make_request("DELETE", f"/customers/{other_customer_id}", token=self.customer_token, expected_status=403)
+        if result["success"]:
+            self.log_test("Customer Delete Prevention", True, "Customer blocked from deleting customers")
+        else:
+            self.log_test("Customer Delete Prevention", False, "Customer not blocked from deleting customers", result)
+        
+        # Test admin deleting a customer
+        result = self.make_request("DELETE", f"/customers/{other_customer_id}", token=self.admin_token)
+        if result["success"]:
+            self.log_test("Customer Deletion", True, "Admin deleted customer successfully")
+        else:
+            self.log_test("Customer Deletion", False, "Customer deletion failed", result)
+        
+        # Test deleting an unknown customer
+        result = self.make_request("DELETE", f"/customers/{other_customer_id}", token=self.admin_token, expected_status=404)
+        if result["success"]:
+            self.log_test("Unknown Customer Deletion", True, "Unknown customer returns 404")
+        else:
+            self.log_test("Unknown Customer Deletion", False, "Unknown customer not handled", result)
+
     def test_chat_endpoints(self):
         """Test chat endpoints (note: these don't require authentication)"""
         print("\n=== Chat API Tests ===")
@@ -270,6 +347,7 @@ class AdditionalAPITestSuite:
         
         # Run all test suites
         self.test_knowledge_base_endpoints()
+        self.test_delete_endpoints()
         self.test_chat_endpoints()
         self.test_additional_auth_scenarios()
         
@@ -0,0 +1,19 @@
+// Read a numeric setting from the environment. Unset values use the default
+// silently; values that are not numbers or fail `isValid` use it with a warning.
+export function numberFromEnv(
+  name: string,
+  defaultValue: number,
+  isValid: (value: number) => boolean = () => true
+): number {
+  const raw = process.env[name];
+  if (raw === undefined || raw.trim() === '') {
+    return defaultValue;
+  }
+
+  const value = Number(raw);
+  if (!Number.isFinite(value) || !isValid(value)) {
+    console.warn(`Invalid ${name} "${raw}", using ${defaultValue}`);
+    return defaultValue;
+  }
+  return value;
+}
@@ -0,0 +1,73 @@
+import { DataTypes, Model, Optional } from 'sequelize';
+import sequelize from '../config/database';
+
+export type ContentEncoding = 'br' | 'identity';
+
+interface ContentBlobAttributes {
+  hash: string;
+  encoding: ContentEncoding;
+  data: Buffer;
+  original_size: number;
+  compressed_size: number;
+  created_at?: Date;
+  last_used_at?: Date;
+}
+
+interface ContentBlobCreationAttributes extends Optional<ContentBlobAttributes, 'created_at' | 'last_used_at'> {}
+
+class ContentBlob extends Model<ContentBlobAttributes, ContentBlobCreationAttributes> implements ContentBlobAttributes {
+  public hash!: string;
+  public encoding!: ContentEncoding;
+  public data!: Buffer;
+  public original_size!: number;
+  public compressed_size!: number;
+  public readonly created_at!: Date;
+  public last_used_at!: Date;
+}
+
+ContentBlob.init(
+  {
+    hash: {
+      type: DataTypes.CHAR(64),
+      primaryKey: true
+    },
+    encoding: {
+      type: DataTypes.STRING(16),
+      allowNull: false,
+      defaultValue: 'br'
+    },
+    data: {
+      type: DataTypes.BLOB('medium'),
+      allowNull: false
+    },
+    original_size: {
+      type: DataTypes.INTEGER.UNSIGNED,
+      allowNull: false
+    },
+    compressed_size: {
+      type: DataTypes.INTEGER.UNSIGNED,
+      allowNull: false
+    },
+    created_at: {
+      type: DataTypes.DATE,
+      allowNull: false,
+      defaultValue: DataTypes.NOW
+    },
+    last_used_at: {
+      type: DataTypes.DATE,
+      allowNull: false,
+      defaultValue: DataTypes.NOW
+    }
+  },
+  {
+    sequelize,
+    tableName: 'content_blobs',
+    // Overrides the global define default; created_at is set by its column default
+    timestamps: false,
+    indexes: [
+      { name: 'idx_last_used_at', fields: ['last_used_at'] }
+    ]
+  }
+);
+
+export default ContentBlob;
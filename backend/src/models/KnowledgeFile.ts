@@ -7,7 +7,7 @@ interface KnowledgeFileAttributes {
   customer_id: string;
   filename: string;
   file_type: string;
-  content: string;
+  content_hash: string;
   uploaded_at?: Date;
   updated_at?: Date;
 }
@@ -19,7 +19,7 @@ class KnowledgeFile extends Model<KnowledgeFileAttributes, KnowledgeFileCreation
   public customer_id!: string;
   public filename!: string;
   public file_type!: string;
-  public content!: string;
+  public content_hash!: string;
   public readonly uploaded_at!: Date;
   public readonly updated_at!: Date;
 }
@@ -47,9 +47,13 @@ KnowledgeFile.init(
       type: DataTypes.STRING(50),
       allowNull: false
     },
-    content: {
-      type: DataTypes.TEXT('medium'),
-      allowNull: false
+    content_hash: {
+      type: DataTypes.CHAR(64),
+      allowNull: false,
+      references: {
+        model: 'content_blobs',
+        key: 'hash'
+      }
     },
     uploaded_at: {
       type: DataTypes.DATE,
@@ -6,7 +6,7 @@ interface ScrapedContentAttributes {
   id: string;
   customer_id: string;
   url: string;
-  content: string;
+  content_hash: string;
   scraped_at?: Date;
   updated_at?: Date;
 }
@@ -17,7 +17,7 @@ class ScrapedContent extends Model<ScrapedContentAttributes, ScrapedContentCreat
   public id!: string;
   public customer_id!: string;
   public url!: string;
-  public content!: string;
+  public content_hash!: string;
   public readonly scraped_at!: Date;
   public readonly updated_at!: Date;
 }
@@ -41,9 +41,13 @@ ScrapedContent.init(
       type: DataTypes.STRING(1024),
       allowNull: false
     },
-    content: {
-      type: DataTypes.TEXT('medium'),
-      allowNull: false
+    content_hash: {
+      type: DataTypes.CHAR(64),
+      allowNull: false,
+      references: {
+        model: 'content_blobs',
+        key: 'hash'
+      }
     },
     scraped_at: {
       type: DataTypes.DATE,
@@ -0,0 +1,113 @@
+import crypto from 'crypto';
+import { PineconeRecord, RecordMetadata, ScoredPineconeRecord } from '@pinecone-database/pinecone';
+import { VectorIndex, VectorNamespace } from '../services/pineconeService';
+import { ChatMessage } from '../services/chatService';
+
+// Deterministic, network-free stand-ins for OpenAI embeddings, the Pinecone
+// index and the chat LLM, so retrieval can be replayed offline.
+
+function tokenHash(token: string): number {
+  return crypto.createHash('md5').update(token).digest().readUInt32LE(0);
+}
+
+// Feature-hashing embedder over unigrams and bigrams. Similar wording gives
+// similar vectors, which is enough to compare chunking and ranking settings.
+export function createHashingEmbedder(dimension: number = 384) {
+  return async (text: string): Promise<number[]> => {
+    const vector = new Array<number>(dimension).fill(0);
+    const tokens = text.toLowerCase().split(/[^\p{L}\p{N}]+/u).filter(t => t.length > 1);
+    const features = [...tokens, ...tokens.slice(1).map((t, i) => `${tokens[i]} ${t}`)];
+
+    for (const feature of features) {
+      const hash = tokenHash(feature);
+      vector[hash % dimension] += (hash & 0x80000000) ? -1 : 1;
+    }
+
+    const norm = Math.sqrt(vector.reduce((sum, v) => sum + v * v, 0)) || 1;
+    return vector.map(v => v / norm);
+  };
+}
+
+function cosine(a: number[], b: number[]): number {
+  let dot = 0;
+  let normA = 0;
+  let normB = 0;
+  for (let i = 0; i < a.length; i++) {
+    dot += a[i] * b[i];
+    normA += a[i] * a[i];
+    normB += b[i] * b[i];
+  }
+  return normA && normB ? dot / Math.sqrt(normA * normB) : 0;
+}
+
+class InMemoryNamespace implements VectorNamespace {
+  constructor(private records: Map<string, PineconeRecord<RecordMetadata>>) {}
+
+  async upsert(records: PineconeRecord<RecordMetadata>[]): Promise<void> {
+    for (const record of records) {
+      this.records.set(record.id, record);
+    }
+  }
+
+  async query(options: { vector: number[]; topK: number; includeMetadata?: boolean }) {
+    const matches: ScoredPineconeRecord<RecordMetadata>[] = [...this.records.values()]
+      .map(record => ({
+        id: record.id,
+        values: record.values,
+        score: cosine(options.vector, record.values || []),
+        metadata: options.includeMetadata ? record.metadata : undefined
+      }))
+      .sort((a, b) => b.score - a.score)
+      .slice(0, options.topK);
+
+    return { matches };
+  }
+
+  async listPaginated(options: { prefix?: string; limit?: number; paginationToken?: string }) {
+    const ids = [...this.records.keys()]
+      .filter(id => !options.prefix || id.startsWith(options.prefix))
+      .sort();
+    const offset = parseInt(options.paginationToken || '0');
+    const limit = options.limit || 100;
+    const next = offset + limit < ids.length ? String(offset + limit) : undefined;
+
+    return {
+      vectors: ids.slice(offset, offset + limit).map(id => ({ id })),
+      pagination: next ? { next } : undefined
+    };
+  }
+
+  async deleteMany(ids: string[]): Promise<void> {
+    ids.forEach(id => this.records.delete(id));
+  }
+
+  async deleteAll(): Promise<void> {
+    this.records.clear();
+  }
+}
+
+export class InMemoryVectorIndex implements VectorIndex {
+  private namespaces = new Map<string, Map<string, PineconeRecord<RecordMetadata>>>();
+
+  namespace(name: string): VectorNamespace {
+    if (!this.namespaces.has(name)) {
+      this.namespaces.set(name, new Map());
+    }
+    return new InMemoryNamespace(this.namespaces.get(name)!);
+  }
+
+  async describeIndexStats() {
+    const namespaces: Record<string, { recordCount: number }> = {};
+    for (const [name, records] of this.namespaces) {
+      namespaces[name] = { recordCount: records.size };
+    }
+    return { namespaces };
+  }
+}
+
+// Echoes how much context it was given instead of calling an LLM
+export async function stubCompletion(messages: ChatMessage[]): Promise<string> {
+  const system = messages.find(m => m.role === 'system')?.content || '';
+  const chunks = (system.match(/^\[\d+\] From /gm) || []).length;
+  return `Offline stub answer using ${chunks} context chunks.`;
+}
@@ -1,10 +1,20 @@
 import { Router } from 'express';
 import { v4 as uuidv4 } from 'uuid';
 import Customer from '../models/Customer';
+import { PineconeService } from '../services/pineconeService';
 import { authenticate, AuthRequest, isAdmin } from '../middleware/auth';
 
 const router = Router();
 
+// Initialize Pinecone service
+const pineconeService = process.env.PINECONE_API_KEY && process.env.PINECONE_INDEX_NAME
+  ? new PineconeService(
+      process.env.PINECONE_API_KEY,
+      process.env.PINECONE_INDEX_NAME,
+      process.env.OPENAI_API_KEY || ''
+    )
+  : null;
+
 // Create customer (Admin only)
 router.post('/', authenticate, isAdmin, async (req: AuthRequest, res) => {
   try {
@@ -82,4 +92,30 @@ router.get('/:customer_id', authenticate, async (req: AuthRequest, res) => {
   }
 });
 
+// Delete customer and all of their data (Admin only)
+router.delete('/:customer_id', authenticate, isAdmin, async (req: AuthRequest, res) => {
+  try {
+    const customer = await Customer.findOne({
+      where: { id: req.params.customer_id }
+    });
+
+    if (!customer) {
+      return res.status(404).json({ detail: 'Customer not found' });
+    }
+
+    // Rows are removed by CASCADE; orphaned content blobs are left to the GC job
+    await customer.destroy();
+
+    // Purge the customer's Pinecone namespace in background
+    if (pineconeService) {
+      pineconeService.deleteCustomer(customer.id)
+        .catch(err => console.error('Pinecone namespace purge failed:', err));
+    }
+
+    res.json({ message: 'Customer deleted successfully' });
+  } catch (error) {
+    res.status(500).json({ detail: `Error deleting customer: ${error}` });
+  }
+});
+
 export default router;
\ No newline at end of file
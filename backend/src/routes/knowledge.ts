@@ -4,6 +4,7 @@ import { v4 as uuidv4 } from 'uuid';
 import KnowledgeFile from '../models/KnowledgeFile';
 import { FileProcessor } from '../utils/fileProcessor';
 import { PineconeService } from '../services/pineconeService';
+import { ContentStore } from '../services/contentStore';
 import { authenticate, AuthRequest, canAccessCustomer } from '../middleware/auth';
 
 const router = Router();
@@ -47,7 +48,7 @@ router.post('/upload', authenticate, upload.single('file'), async (req: AuthRequ
       customer_id,
       filename: req.file.originalname,
       file_type: req.file.originalname.split('.').pop()?.toLowerCase() || 'unknown',
-      content
+      content_hash: await ContentStore.put(content)
     });
 
     // Upsert to Pinecone in background
@@ -75,7 +76,7 @@ router.get('/:customer_id', authenticate, canAccessCustomer, async (req: AuthReq
   try {
     const files = await KnowledgeFile.findAll({
       where: { customer_id: req.params.customer_id },
-      attributes: { exclude: ['content'] },
+      attributes: { exclude: ['content_hash'] },
       order: [['uploaded_at', 'DESC']]
     });
 
@@ -110,7 +111,7 @@ router.delete('/:file_id', authenticate, async (req: AuthRequest, res) => {
 
     // Delete from Pinecone in background
     if (pineconeService) {
-      pineconeService.deleteKnowledgeFile(req.params.file_id)
+      pineconeService.deleteKnowledgeFile(req.params.file_id, file.customer_id)
         .catch(err => console.error('Pinecone delete failed:', err));
     }
 
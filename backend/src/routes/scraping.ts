@@ -5,6 +5,7 @@ import ScrapeConfig from '../models/ScrapeConfig';
 import ScrapedContent from '../models/ScrapedContent';
 import { WebScraper } from '../utils/webScraper';
 import { PineconeService } from '../services/pineconeService';
+import { ContentStore } from '../services/contentStore';
 import { authenticate, AuthRequest, canAccessCustomer } from '../middleware/auth';
 
 const router = Router();
@@ -103,7 +104,7 @@ router.post('/manual', authenticate, async (req: AuthRequest, res) => {
           id: uuidv4(),
           customer_id,
           url,
-          content
+          content_hash: await ContentStore.put(content)
         });
 
         // Upsert to Pinecone in background
@@ -133,7 +134,7 @@ router.get('/content/:customer_id', authenticate, canAccessCustomer, async (req:
   try {
     const content = await ScrapedContent.findAll({
       where: { customer_id: req.params.customer_id },
-      attributes: { exclude: ['content'] },
+      attributes: { exclude: ['content_hash'] },
       order: [['scraped_at', 'DESC']]
     });
 
@@ -148,6 +149,34 @@ router.get('/content/:customer_id', authenticate, canAccessCustomer, async (req:
   }
 });
 
+// Delete scraped content (Admin or customer owner)
+router.delete('/content/:content_id', authenticate, async (req: AuthRequest, res) => {
+  try {
+    const scraped = await ScrapedContent.findOne({ where: { id: req.params.content_id } });
+
+    if (!scraped) {
+      return res.status(404).json({ detail: 'Scraped content not found' });
+    }
+
+    // Check authorization
+    if (req.user?.role !== 'admin' && req.user?.customer_id !== scraped.customer_id) {
+      return res.status(403).json({ detail: 'You can only delete your own scraped content' });
+    }
+
+    await scraped.destroy();
+
+    // Delete from Pinecone in background
+    if (pineconeService) {
+      pineconeService.deleteScrapedContent(req.params.content_id, scraped.customer_id)
+        .catch(err => console.error('Pinecone delete failed:', err));
+    }
+
+    res.json({ message: 'Scraped content deleted successfully' });
+  } catch (error) {
+    res.status(500).json({ detail: `Error deleting scraped content: ${error}` });
+  }
+});
+
 // Helper function
 async function scrapeUrlsForCustomer(customerId: string) {
   const configs = await ScrapeConfig.findAll({
@@ -162,7 +191,7 @@ async function scrapeUrlsForCustomer(customerId: string) {
           id: uuidv4(),
           customer_id: customerId,
           url,
-          content
+          content_hash: await ContentStore.put(content)
         });
 
         // Upsert to Pinecone in background
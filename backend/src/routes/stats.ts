@@ -2,25 +2,55 @@ import { Router } from 'express';
 import KnowledgeFile from '../models/KnowledgeFile';
 import ScrapedContent from '../models/ScrapedContent';
 import Conversation from '../models/Conversation';
-import { authenticate, AuthRequest, canAccessCustomer } from '../middleware/auth';
+import { PineconeService } from '../services/pineconeService';
+import { retrievalMetrics } from '../services/retrievalMetrics';
+import { authenticate, AuthRequest, canAccessCustomer, isAdmin } from '../middleware/auth';
 
 const router = Router();
 
+// Initialize Pinecone service
+const pineconeService = process.env.PINECONE_API_KEY && process.env.PINECONE_INDEX_NAME
+  ? new PineconeService(
+      process.env.PINECONE_API_KEY,
+      process.env.PINECONE_INDEX_NAME,
+      process.env.OPENAI_API_KEY || ''
+    )
+  : null;
+
+// Retrieval pipeline metrics: hit rates and per-stage latency (Admin only)
+router.get('/retrieval/metrics', authenticate, isAdmin, async (req: AuthRequest, res) => {
+  res.json(retrievalMetrics.snapshot());
+});
+
+// Reset retrieval metrics, e.g. after changing RERANK_* settings (Admin only)
+router.delete('/retrieval/metrics', authenticate, isAdmin, async (req: AuthRequest, res) => {
+  retrievalMetrics.reset();
+  res.json({ message: 'Retrieval metrics reset' });
+});
+
 // Get stats for customer (Admin or customer owner)
 router.get('/:customer_id', authenticate, canAccessCustomer, async (req: AuthRequest, res) => {
   try {
     const { customer_id } = req.params;
 
-    const [kbCount, scrapedCount, conversationCount] = await Promise.all([
+    const [kbCount, scrapedCount, conversationCount, vectorCount] = await Promise.all([
       KnowledgeFile.count({ where: { customer_id } }),
       ScrapedContent.count({ where: { customer_id } }),
-      Conversation.count({ where: { customer_id } })
+      Conversation.count({ where: { customer_id } }),
+      // Vector count is informational; don't fail stats if Pinecone is unavailable
+      pineconeService
+        ? pineconeService.getVectorCount(customer_id).catch(err => {
+            console.error('Pinecone stats failed:', err);
+            return null;
+          })
+        : Promise.resolve(null)
     ]);
 
     res.json({
       knowledge_files: kbCount,
       scraped_pages: scrapedCount,
-      conversations: conversationCount
+      conversations: conversationCount,
+      vectors: vectorCount
     });
   } catch (error) {
     res.status(500).json({ detail: `Error fetching stats: ${error}` });
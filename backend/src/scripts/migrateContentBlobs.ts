@@ -0,0 +1,155 @@
+import { DataTypes, QueryTypes } from 'sequelize';
+import sequelize from '../config/database';
+import ContentBlob from '../models/ContentBlob';
+import { ContentStore } from '../services/contentStore';
+
+// Moves inline `content` columns of knowledge_files and scraped_contents into
+// the content_blobs store and reports the resulting storage savings.
+//
+// Usage:
+//   npm run migrate:content-blobs                # backfill, keep legacy column
+//   npm run migrate:content-blobs -- --drop-legacy
+
+const TABLES = ['knowledge_files', 'scraped_contents'];
+const BATCH_SIZE = 100;
+
+function formatBytes(bytes: number): string {
+  return `${(bytes / 1024 / 1024).toFixed(2)} MB`;
+}
+
+async function prepareTable(table: string): Promise<boolean> {
+  const queryInterface = sequelize.getQueryInterface();
+  const columns = await queryInterface.describeTable(table);
+
+  if (!columns.content_hash) {
+    console.log(`Adding content_hash column to ${table}`);
+    await queryInterface.addColumn(table, 'content_hash', {
+      type: DataTypes.CHAR(64),
+      allowNull: true
+    });
+    await queryInterface.addIndex(table, ['content_hash'], { name: 'idx_content_hash' });
+  }
+
+  if (!columns.content) {
+    return false;
+  }
+
+  // New rows no longer write the legacy column
+  await queryInterface.changeColumn(table, 'content', {
+    type: DataTypes.TEXT('medium'),
+    allowNull: true
+  });
+  return true;
+}
+
+async function backfillTable(table: string): Promise<number> {
+  let migrated = 0;
+
+  while (true) {
+    const rows = await sequelize.query<{ id: string; content: string }>(
+      `SELECT id, content FROM ${table}
+       WHERE content_hash IS NULL AND content IS NOT NULL
+       LIMIT ${BATCH_SIZE}`,
+      { type: QueryTypes.SELECT }
+    );
+
+    if (rows.length === 0) {
+      break;
+    }
+
+    for (const row of rows) {
+      const hash = await ContentStore.put(row.content);
+      await sequelize.query(
+        `UPDATE ${table} SET content_hash = ?, content = NULL WHERE id = ?`,
+        { replacements: [hash, row.id] }
+      );
+    }
+
+    migrated += rows.length;
+    console.log(`  ${table}: ${migrated} rows migrated`);
+  }
+
+  return migrated;
+}
+
+async function dropLegacyColumn(table: string): Promise<void> {
+  const queryInterface = sequelize.getQueryInterface();
+
+  const [{ pending }] = await sequelize.query<{ pending: number }>(
+    `SELECT COUNT(*) AS pending FROM ${table} WHERE content_hash IS NULL`,
+    { type: QueryTypes.SELECT }
+  );
+  if (Number(pending) > 0) {
+    throw new Error(`${table} still has ${pending} rows without content_hash`);
+  }
+
+  console.log(`Dropping legacy content column from ${table}`);
+  await queryInterface.removeColumn(table, 'content');
+  await queryInterface.changeColumn(table, 'content_hash', {
+    type: DataTypes.CHAR(64),
+    allowNull: false
+  });
+  await queryInterface.addConstraint(table, {
+    fields: ['content_hash'],
+    type: 'foreign key',
+    name: `fk_${table}_content_hash`,
+    references: { table: 'content_blobs', field: 'hash' }
+  });
+}
+
+// sync() only creates missing tables, so a content_blobs table from an earlier
+// run would otherwise never get the index garbage collection filters on
+async function prepareBlobTable(): Promise<void> {
+  await ContentBlob.sync();
+
+  const queryInterface = sequelize.getQueryInterface();
+  const indexes = await queryInterface.showIndex('content_blobs') as { name: string }[];
+  if (!indexes.some(index => index.name === 'idx_last_used_at')) {
+    console.log('Adding idx_last_used_at index to content_blobs');
+    await queryInterface.addIndex('content_blobs', ['last_used_at'], { name: 'idx_last_used_at' });
+  }
+}
+
+async function main() {
+  const dropLegacy = process.argv.includes('--drop-legacy');
+
+  await sequelize.authenticate();
+  await prepareBlobTable();
+
+  for (const table of TABLES) {
+    const hasLegacyColumn = await prepareTable(table);
+    if (!hasLegacyColumn) {
+      console.log(`${table}: already migrated`);
+      continue;
+    }
+
+    console.log(`Backfilling ${table}`);
+    const migrated = await backfillTable(table);
+    console.log(`${table}: ${migrated} rows moved to content_blobs`);
+
+    if (dropLegacy) {
+      await dropLegacyColumn(table);
+    }
+  }
+
+  const stats = await ContentStore.getStorageStats();
+  console.log('\nContent storage report');
+  console.log(`  Rows referencing content: ${stats.references}`);
+  console.log(`  Unique blobs:             ${stats.unique_blobs}`);
+  console.log(`  Inline size (before):     ${formatBytes(stats.logical_bytes)}`);
+  console.log(`  Deduplicated size:        ${formatBytes(stats.unique_bytes)}`);
+  console.log(`  Stored size (after):      ${formatBytes(stats.stored_bytes)}`);
+  console.log(`  Savings:                  ${(stats.savings_ratio * 100).toFixed(1)}%`);
+
+  if (!dropLegacy) {
+    console.log('\nLegacy content columns kept; re-run with --drop-legacy to remove them.');
+  }
+}
+
+main()
+  .then(() => sequelize.close())
+  .catch(async err => {
+    console.error('Content blob migration failed:', err);
+    await sequelize.close();
+    process.exit(1);
+  });
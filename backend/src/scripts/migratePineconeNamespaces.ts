@@ -0,0 +1,91 @@
+import dotenv from 'dotenv';
+import { Pinecone, PineconeRecord, RecordMetadata } from '@pinecone-database/pinecone';
+import { PineconeService } from '../services/pineconeService';
+
+// Re-homes vectors from the shared default namespace into per-customer
+// namespaces, using the customer_id stored in each vector's metadata.
+//
+// Usage:
+//   npm run migrate:pinecone-namespaces                 # move vectors
+//   npm run migrate:pinecone-namespaces -- --dry-run    # only count them
+//   npm run migrate:pinecone-namespaces -- --keep-source
+
+dotenv.config();
+
+const BATCH_SIZE = 100;
+
+async function main() {
+  const apiKey = process.env.PINECONE_API_KEY;
+  const indexName = process.env.PINECONE_INDEX_NAME;
+  if (!apiKey || !indexName) {
+    throw new Error('PINECONE_API_KEY and PINECONE_INDEX_NAME are required');
+  }
+
+  const dryRun = process.argv.includes('--dry-run');
+  const keepSource = process.argv.includes('--keep-source');
+
+  const index = new Pinecone({ apiKey }).index(indexName);
+  const source = index.namespace('');
+
+  // List all IDs up front so deleting moved vectors can't disturb pagination
+  const allIds: string[] = [];
+  let paginationToken: string | undefined;
+  do {
+    const page = await source.listPaginated({ limit: BATCH_SIZE, paginationToken });
+    allIds.push(...(page.vectors || []).map(v => v.id).filter((id): id is string => !!id));
+    paginationToken = page.pagination?.next;
+  } while (paginationToken);
+
+  console.log(`Found ${allIds.length} vectors in the default namespace`);
+
+  const moved = new Map<string, number>();
+  let skipped = 0;
+
+  for (let i = 0; i < allIds.length; i += BATCH_SIZE) {
+    const ids = allIds.slice(i, i + BATCH_SIZE);
+    const fetched = await source.fetch(ids);
+
+    // Group the batch by destination namespace
+    const byNamespace = new Map<string, PineconeRecord<RecordMetadata>[]>();
+    for (const record of Object.values(fetched.records)) {
+      const customerId = record.metadata?.customer_id;
+      if (typeof customerId !== 'string' || !customerId) {
+        skipped++;
+        continue;
+      }
+
+      const namespace = PineconeService.namespaceFor(customerId);
+      const records = byNamespace.get(namespace) || [];
+      records.push(record);
+      byNamespace.set(namespace, records);
+      moved.set(customerId, (moved.get(customerId) || 0) + 1);
+    }
+
+    if (!dryRun) {
+      for (const [namespace, records] of byNamespace) {
+        await index.namespace(namespace).upsert(records);
+      }
+
+      // Only delete what was successfully copied
+      const copiedIds = [...byNamespace.values()].flat().map(r => r.id);
+      if (!keepSource && copiedIds.length > 0) {
+        await source.deleteMany(copiedIds);
+      }
+    }
+
+    console.log(`  ${Math.min(i + BATCH_SIZE, allIds.length)}/${allIds.length} vectors processed`);
+  }
+
+  console.log(`\nPinecone namespace migration${dryRun ? ' (dry run)' : ''}`);
+  for (const [customerId, count] of moved) {
+    console.log(`  ${PineconeService.namespaceFor(customerId)}: ${count} vectors`);
+  }
+  if (skipped > 0) {
+    console.log(`  ${skipped} vectors without customer_id left in the default namespace`);
+  }
+}
+
+main().catch(err => {
+  console.error('Pinecone namespace migration failed:', err);
+  process.exit(1);
+});
@@ -0,0 +1,193 @@
+import fs from 'fs/promises';
+import path from 'path';
+import { FileProcessor } from '../utils/fileProcessor';
+import { PineconeService } from '../services/pineconeService';
+import { ChatService } from '../services/chatService';
+import { retrievalMetrics, summarizeDurations } from '../services/retrievalMetrics';
+import { createHashingEmbedder, InMemoryVectorIndex, stubCompletion } from '../replay/offlineStubs';
+
+// Offline replay of the retrieval pipeline. Ingests a fixture corpus through
+// FileProcessor -> chunker -> vector store, replays questions concurrently and
+// writes recall@K, MRR and per-stage latency as JSON so configurations can be
+// compared run against run.
+//
+// Fixture layout:
+//   <fixture>/corpus/*              documents in any format FileProcessor supports
+//   <fixture>/questions.json        [{ "question": "...", "expected_sources": ["file.md"] }]
+//
+// Usage:
+//   npm run replay -- --fixture fixtures/replay/sample --top-k 5 --candidates 50 \
+//     --rerank mmr --chunk-size 2000 --concurrency 8 --out replay-report.json
+
+const REPLAY_CUSTOMER_ID = 'replay';
+
+interface ReplayQuestion {
+  question: string;
+  expected_sources: string[];
+}
+
+interface QuestionResult {
+  question: string;
+  expected_sources: string[];
+  sources: string[];
+  first_relevant_rank: number | null;
+  latency_ms: number;
+}
+
+function parseArgs(argv: string[]) {
+  const args = new Map<string, string>();
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i].startsWith('--')) {
+      args.set(argv[i].slice(2), argv[i + 1]);
+      i++;
+    }
+  }
+
+  return {
+    fixture: args.get('fixture') || 'fixtures/replay/sample',
+    label: args.get('label') || 'default',
+    topK: parseInt(args.get('top-k') || '5'),
+    candidateK: parseInt(args.get('candidates') || '50'),
+    rerank: args.get('rerank') || 'mmr',
+    rerankBudgetMs: parseInt(args.get('budget-ms') || '150'),
+    chunkSize: parseInt(args.get('chunk-size') || '2000'),
+    concurrency: parseInt(args.get('concurrency') || '8'),
+    out: args.get('out') || 'replay-report.json'
+  };
+}
+
+// Run tasks with at most `limit` in flight, preserving result order
+async function runPool<T, R>(items: T[], limit: number, task: (item: T) => Promise<R>): Promise<R[]> {
+  const results = new Array<R>(items.length);
+  let next = 0;
+
+  const workers = Array.from({ length: Math.min(limit, items.length) }, async () => {
+    while (next < items.length) {
+      const idx = next++;
+      results[idx] = await task(items[idx]);
+    }
+  });
+
+  await Promise.all(workers);
+  return results;
+}
+
+async function timed<R>(samples: number[], fn: () => Promise<R>): Promise<R> {
+  const start = performance.now();
+  const result = await fn();
+  samples.push(performance.now() - start);
+  return result;
+}
+
+async function main() {
+  const config = parseArgs(process.argv.slice(2));
+
+  const pineconeService = new PineconeService('offline', 'replay', 'offline', {
+    index: new InMemoryVectorIndex(),
+    embedder: createHashingEmbedder(),
+    chunkSize: config.chunkSize
+  });
+  const chatService = new ChatService('offline', undefined, undefined, {
+    pineconeService,
+    complete: stubCompletion,
+    topK: config.topK,
+    candidateK: config.candidateK,
+    rerankStrategy: config.rerank,
+    rerankBudgetMs: config.rerankBudgetMs
+  });
+
+  // Ingest
+  const corpusDir = path.join(config.fixture, 'corpus');
+  const filenames = (await fs.readdir(corpusDir)).sort();
+  const extractSamples: number[] = [];
+  const upsertSamples: number[] = [];
+
+  await runPool(filenames, config.concurrency, async filename => {
+    const buffer = await fs.readFile(path.join(corpusDir, filename));
+    const content = await timed(extractSamples, () => FileProcessor.extractText(buffer, filename));
+    await timed(upsertSamples, () =>
+      pineconeService.upsertKnowledgeFile(filename, REPLAY_CUSTOMER_ID, filename, content)
+    );
+  });
+
+  const chunkCount = await pineconeService.getVectorCount(REPLAY_CUSTOMER_ID);
+
+  // Replay questions
+  const questions: ReplayQuestion[] = JSON.parse(
+    await fs.readFile(path.join(config.fixture, 'questions.json'), 'utf-8')
+  );
+  if (filenames.length === 0 || questions.length === 0) {
+    throw new Error(`Fixture ${config.fixture} needs at least one document and one question`);
+  }
+  retrievalMetrics.reset();
+
+  const results = await runPool(questions, config.concurrency, async (q): Promise<QuestionResult> => {
+    const start = performance.now();
+    const { sources } = await chatService.chat(REPLAY_CUSTOMER_ID, q.question, 'replay');
+    const latency = performance.now() - start;
+
+    const rank = sources.findIndex(source => q.expected_sources.includes(source));
+    return {
+      question: q.question,
+      expected_sources: q.expected_sources,
+      sources,
+      first_relevant_rank: rank >= 0 ? rank + 1 : null,
+      latency_ms: latency
+    };
+  });
+
+  // Score
+  const kValues = [...new Set([1, 3, 5, config.topK])].filter(k => k <= config.topK).sort((a, b) => a - b);
+  const recallAtK: Record<string, number> = {};
+  for (const k of kValues) {
+    const recalls = results.map(r => {
+      const found = r.expected_sources.filter(source => r.sources.slice(0, k).includes(source));
+      return r.expected_sources.length > 0 ? found.length / r.expected_sources.length : 0;
+    });
+    recallAtK[k] = recalls.reduce((sum, v) => sum + v, 0) / (recalls.length || 1);
+  }
+
+  const mrr = results.reduce(
+    (sum, r) => sum + (r.first_relevant_rank ? 1 / r.first_relevant_rank : 0),
+    0
+  ) / (results.length || 1);
+
+  const retrieval = retrievalMetrics.snapshot();
+  const report = {
+    label: config.label,
+    generated_at: new Date().toISOString(),
+    config,
+    corpus: {
+      documents: filenames.length,
+      chunks: chunkCount
+    },
+    quality: {
+      questions: results.length,
+      recall_at_k: recallAtK,
+      mrr,
+      hit_rate: results.filter(r => r.first_relevant_rank !== null).length / (results.length || 1)
+    },
+    rerank: {
+      fallback_rate: retrieval.fallback_rate,
+      promotion_rate: retrieval.promotion_rate
+    },
+    latency_ms: {
+      extract: summarizeDurations(extractSamples),
+      upsert: summarizeDurations(upsertSamples),
+      ...retrieval.stages,
+      chat: summarizeDurations(results.map(r => r.latency_ms))
+    },
+    questions: results
+  };
+
+  await fs.writeFile(config.out, JSON.stringify(report, null, 2));
+  console.log(
+    `\nReplay "${config.label}": recall@${config.topK}=${recallAtK[config.topK].toFixed(3)} ` +
+    `mrr=${mrr.toFixed(3)} chat p95=${report.latency_ms.chat.p95_ms.toFixed(1)}ms -> ${config.out}`
+  );
+}
+
+main().catch(err => {
+  console.error('Replay failed:', err);
+  process.exit(1);
+});
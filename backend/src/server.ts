@@ -1,7 +1,9 @@
 import express, { Request, Response } from 'express';
 import cors from 'cors';
 import dotenv from 'dotenv';
+import cron from 'node-cron';
 import sequelize from './config/database';
+import { ContentStore } from './services/contentStore';
 import authRouter from './routes/auth';
 import customersRouter from './routes/customers';
 import knowledgeRouter from './routes/knowledge';
@@ -32,6 +34,19 @@ sequelize.authenticate()
   .then(() => console.log('✓ Connected to MySQL'))
   .catch(err => console.error('✗ MySQL connection error:', err));
 
+// Remove content blobs no longer referenced by any file or scraped page
+const contentGcGraceMinutes = parseInt(process.env.CONTENT_GC_GRACE_MINUTES || '60');
+cron.schedule(process.env.CONTENT_GC_SCHEDULE || '30 * * * *', async () => {
+  try {
+    const removed = await ContentStore.collectGarbage(contentGcGraceMinutes);
+    if (removed > 0) {
+      console.log(`✓ Removed ${removed} unreferenced content blobs`);
+    }
+  } catch (err) {
+    console.error('✗ Content blob GC failed:', err);
+  }
+});
+
 // Routes
 app.get('/api', (req: Request, res: Response) => {
   res.json({ message: 'KbaseAI Chatbot API is running' });
@@ -1,18 +1,48 @@
 import OpenAI from 'openai';
+import { numberFromEnv } from '../config/env';
 import { PineconeService } from './pineconeService';
+import { Reranker, createReranker, rerankWithBudget } from './reranker';
+import { retrievalMetrics } from './retrievalMetrics';
+
+export interface ChatMessage {
+  role: 'system' | 'user';
+  content: string;
+}
+
+export type CompletionFn = (messages: ChatMessage[]) => Promise<string>;
+
+// Overrides for running chat without live services (e.g. offline replay)
+export interface ChatServiceOptions {
+  pineconeService?: PineconeService;
+  complete?: CompletionFn;
+  topK?: number;
+  candidateK?: number;
+  rerankStrategy?: string;
+  rerankBudgetMs?: number;
+}
+
+const isPositiveInteger = (value: number) => Number.isInteger(value) && value > 0;
 
 export class ChatService {
   private openai: OpenAI;
+  private complete: CompletionFn;
   private pineconeService: PineconeService | null;
+  private reranker: Reranker;
+  private topK: number;
+  private candidateK: number;
+  private rerankBudgetMs: number;
 
-  constructor(apiKey: string, pineconeApiKey?: string, pineconeIndex?: string) {
+  constructor(apiKey: string, pineconeApiKey?: string, pineconeIndex?: string, options: ChatServiceOptions = {}) {
     this.openai = new OpenAI({
       apiKey: apiKey,
       baseURL: process.env.OPENAI_BASE_URL || 'https://api.emergent.sh/openai/v1'
     });
+    this.complete = options.complete || (messages => this.createCompletion(messages));
 
     // Initialize Pinecone if credentials provided
-    if (pineconeApiKey && pineconeIndex) {
+    if (options.pineconeService) {
+      this.pineconeService = options.pineconeService;
+    } else if (pineconeApiKey && pineconeIndex) {
       this.pineconeService = new PineconeService(pineconeApiKey, pineconeIndex, apiKey);
       // Initialize index in background
       this.pineconeService.initializeIndex().catch(console.error);
@@ -20,13 +50,42 @@ export class ChatService {
       this.pineconeService = null;
       console.warn('Pinecone not configured, using fallback context retrieval');
     }
+
+    // Over-fetch candidates from Pinecone and re-rank them down to topK
+    this.reranker = createReranker(options.rerankStrategy);
+    this.topK = options.topK || numberFromEnv('CHAT_TOP_K', 5, isPositiveInteger);
+    this.candidateK = Math.max(
+      this.topK,
+      options.candidateK || numberFromEnv('RERANK_CANDIDATES', 50, isPositiveInteger)
+    );
+    this.rerankBudgetMs = options.rerankBudgetMs || numberFromEnv('RERANK_BUDGET_MS', 150, value => value > 0);
+  }
+
+  private async createCompletion(messages: ChatMessage[]): Promise<string> {
+    const completion = await this.openai.chat.completions.create({
+      model: 'gpt-4o-mini',
+      messages,
+      temperature: 0.7,
+      max_tokens: 1000
+    });
+
+    return completion.choices[0]?.message?.content || 'Sorry, I could not generate a response.';
   }
 
   async getKnowledgeContext(customerId: string, query: string): Promise<{ context: string; sources: string[] }> {
     // Use Pinecone if available
     if (this.pineconeService) {
       try {
-        const results = await this.pineconeService.queryRelevantContext(customerId, query, 5);
+        const start = performance.now();
+        const candidates = await this.pineconeService.queryRelevantContext(customerId, query, this.candidateK);
+        const results = await rerankWithBudget(
+          this.reranker,
+          query,
+          candidates,
+          this.topK,
+          this.rerankBudgetMs
+        );
+        retrievalMetrics.recordStage('total', performance.now() - start);
         
         const context = results.map((r, idx) => 
           `[${idx + 1}] From ${r.source}:\n${r.text}`
@@ -44,33 +103,38 @@ export class ChatService {
     // Fallback: Use simple MySQL retrieval
     const KnowledgeFile = (await import('../models/KnowledgeFile')).default;
     const ScrapedContent = (await import('../models/ScrapedContent')).default;
+    const { ContentStore } = await import('./contentStore');
 
     const kbFiles = await KnowledgeFile.findAll({
       where: { customer_id: customerId },
-      attributes: ['filename', 'content'],
+      attributes: ['filename', 'content_hash'],
       limit: 5,
       order: [['uploaded_at', 'DESC']]
     });
 
     const scrapedContent = await ScrapedContent.findAll({
       where: { customer_id: customerId },
-      attributes: ['url', 'content'],
+      attributes: ['url', 'content_hash'],
       limit: 5,
       order: [['scraped_at', 'DESC']]
     });
 
+    // Only the first 1000 chars are used, so only that much is decompressed
+    const [kbPrefixes, scrapedPrefixes] = await Promise.all([
+      Promise.all(kbFiles.map(kb => ContentStore.getPrefix(kb.content_hash, 1000))),
+      Promise.all(scrapedContent.map(sc => ContentStore.getPrefix(sc.content_hash, 1000)))
+    ]);
+
     const allContent: string[] = [];
     const sources: string[] = [];
 
-    kbFiles.forEach(kb => {
-      const content = kb.content || '';
-      allContent.push(`From ${kb.filename}: ${content.substring(0, 1000)}`);
+    kbFiles.forEach((kb, idx) => {
+      allContent.push(`From ${kb.filename}: ${kbPrefixes[idx]}`);
       sources.push(kb.filename);
     });
 
-    scrapedContent.forEach(sc => {
-      const content = sc.content || '';
-      allContent.push(`From ${sc.url}: ${content.substring(0, 1000)}`);
+    scrapedContent.forEach((sc, idx) => {
+      allContent.push(`From ${sc.url}: ${scrapedPrefixes[idx]}`);
       sources.push(sc.url);
     });
 
@@ -88,17 +152,10 @@ Context:
 ${context}`;
 
     try {
-      const completion = await this.openai.chat.completions.create({
-        model: 'gpt-4o-mini',
-        messages: [
-          { role: 'system', content: systemMessage },
-          { role: 'user', content: message }
-        ],
-        temperature: 0.7,
-        max_tokens: 1000
-      });
-
-      const response = completion.choices[0]?.message?.content || 'Sorry, I could not generate a response.';
+      const response = await this.complete([
+        { role: 'system', content: systemMessage },
+        { role: 'user', content: message }
+      ]);
       return { response, sources };
     } catch (error) {
       console.error('OpenAI API error:', error);
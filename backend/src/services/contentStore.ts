@@ -0,0 +1,161 @@
+import crypto from 'crypto';
+import zlib from 'zlib';
+import { promisify } from 'util';
+import { QueryTypes, UniqueConstraintError } from 'sequelize';
+import sequelize from '../config/database';
+import ContentBlob, { ContentEncoding } from '../models/ContentBlob';
+
+const brotliCompress = promisify(zlib.brotliCompress);
+
+export interface ContentStorageStats {
+  references: number;
+  unique_blobs: number;
+  logical_bytes: number;
+  unique_bytes: number;
+  stored_bytes: number;
+  savings_ratio: number;
+}
+
+// Content-addressed store for extracted text. Knowledge files and scraped
+// pages reference blobs by SHA-256, so identical bodies are stored once.
+//
+// Blobs are never deleted from request handlers: a concurrent put() may be
+// about to reference a blob whose last row was just removed. Instead,
+// collectGarbage() removes unreferenced blobs not used within a grace period.
+export class ContentStore {
+  static hash(text: string): string {
+    return crypto.createHash('sha256').update(text, 'utf8').digest('hex');
+  }
+
+  // Store text (if not already present) and return its hash
+  static async put(text: string): Promise<string> {
+    const hash = ContentStore.hash(text);
+
+    // Skip compression entirely for content we already have. Bumping
+    // last_used_at keeps garbage collection away until the caller's row exists.
+    const [touched] = await ContentBlob.update(
+      { last_used_at: new Date() },
+      { where: { hash } }
+    );
+    if (touched > 0) {
+      return hash;
+    }
+
+    const raw = Buffer.from(text, 'utf8');
+    const compressed = await brotliCompress(raw, {
+      params: {
+        [zlib.constants.BROTLI_PARAM_MODE]: zlib.constants.BROTLI_MODE_TEXT,
+        [zlib.constants.BROTLI_PARAM_QUALITY]: 9,
+        [zlib.constants.BROTLI_PARAM_SIZE_HINT]: raw.length
+      }
+    });
+
+    // Very small bodies can grow when compressed; keep those as-is
+    const encoding: ContentEncoding = compressed.length < raw.length ? 'br' : 'identity';
+    const data = encoding === 'br' ? compressed : raw;
+
+    try {
+      await ContentBlob.create({
+        hash,
+        encoding,
+        data,
+        original_size: raw.length,
+        compressed_size: data.length
+      });
+    } catch (error) {
+      // Another request stored the same content concurrently
+      if (!(error instanceof UniqueConstraintError)) {
+        throw error;
+      }
+    }
+
+    return hash;
+  }
+
+  // Decompress only as much as needed to return the first maxChars characters
+  static async getPrefix(hash: string, maxChars: number): Promise<string> {
+    const blob = await ContentBlob.findByPk(hash);
+    if (!blob) {
+      // Context is best-effort, so a dangling reference degrades to no text
+      console.warn(`Content blob ${hash} not found`);
+      return '';
+    }
+
+    if (blob.encoding === 'identity') {
+      return blob.data.toString('utf8').substring(0, maxChars);
+    }
+
+    // A UTF-8 character is at most 4 bytes, so this many bytes is always enough
+    const maxBytes = maxChars * 4;
+
+    const raw = await new Promise<Buffer>((resolve, reject) => {
+      const chunks: Buffer[] = [];
+      let size = 0;
+      const stream = zlib.createBrotliDecompress();
+
+      stream.on('data', (chunk: Buffer) => {
+        chunks.push(chunk);
+        size += chunk.length;
+        if (size >= maxBytes) {
+          stream.destroy();
+          resolve(Buffer.concat(chunks));
+        }
+      });
+      stream.on('end', () => resolve(Buffer.concat(chunks)));
+      stream.on('error', reject);
+      stream.end(blob.data);
+    });
+
+    return raw.toString('utf8').substring(0, maxChars);
+  }
+
+  // Delete blobs that no row references and that put() has not handed out
+  // within the grace period. Returns the number of blobs removed.
+  static async collectGarbage(graceMinutes: number = 60): Promise<number> {
+    const cutoff = new Date(Date.now() - graceMinutes * 60 * 1000);
+
+    const [result] = await sequelize.query(
+      `DELETE FROM content_blobs
+       WHERE last_used_at < ?
+         AND NOT EXISTS (SELECT 1 FROM knowledge_files k WHERE k.content_hash = content_blobs.hash)
+         AND NOT EXISTS (SELECT 1 FROM scraped_contents s WHERE s.content_hash = content_blobs.hash)`,
+      { replacements: [cutoff] }
+    );
+
+    return (result as { affectedRows?: number }).affectedRows || 0;
+  }
+
+  // Compare the bytes rows would occupy if stored inline with what is actually stored
+  static async getStorageStats(): Promise<ContentStorageStats> {
+    const [refs] = await sequelize.query<{ references: number; logical_bytes: number }>(
+      `SELECT COUNT(*) AS \`references\`, COALESCE(SUM(b.original_size), 0) AS logical_bytes
+       FROM (
+         SELECT content_hash FROM knowledge_files
+         UNION ALL
+         SELECT content_hash FROM scraped_contents
+       ) r
+       JOIN content_blobs b ON b.hash = r.content_hash`,
+      { type: QueryTypes.SELECT }
+    );
+
+    const [blobs] = await sequelize.query<{ unique_blobs: number; unique_bytes: number; stored_bytes: number }>(
+      `SELECT COUNT(*) AS unique_blobs,
+              COALESCE(SUM(original_size), 0) AS unique_bytes,
+              COALESCE(SUM(compressed_size), 0) AS stored_bytes
+       FROM content_blobs`,
+      { type: QueryTypes.SELECT }
+    );
+
+    const logicalBytes = Number(refs.logical_bytes);
+    const storedBytes = Number(blobs.stored_bytes);
+
+    return {
+      references: Number(refs.references),
+      unique_blobs: Number(blobs.unique_blobs),
+      logical_bytes: logicalBytes,
+      unique_bytes: Number(blobs.unique_bytes),
+      stored_bytes: storedBytes,
+      savings_ratio: logicalBytes > 0 ? 1 - storedBytes / logicalBytes : 0
+    };
+  }
+}
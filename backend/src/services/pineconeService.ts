@@ -1,7 +1,8 @@
-import { Pinecone } from '@pinecone-database/pinecone';
+import { Pinecone, PineconeRecord, RecordMetadata, ScoredPineconeRecord } from '@pinecone-database/pinecone';
 import OpenAI from 'openai';
+import { retrievalMetrics } from './retrievalMetrics';
 
-interface VectorMetadata {
+type VectorMetadata = {
   customer_id: string;
   file_id?: string;
   filename?: string;
@@ -9,24 +10,74 @@ interface VectorMetadata {
   chunk_index: number;
   text: string;
   source_type: 'file' | 'scraped';
+};
+
+export interface ContextMatch {
+  text: string;
+  source: string;
+  score: number;
+}
+
+// The subset of a Pinecone index namespace this service uses
+export interface VectorNamespace {
+  upsert(records: PineconeRecord<RecordMetadata>[]): Promise<void>;
+  query(options: { vector: number[]; topK: number; includeMetadata?: boolean }): Promise<{
+    matches: ScoredPineconeRecord<RecordMetadata>[];
+  }>;
+  listPaginated(options: { prefix?: string; limit?: number; paginationToken?: string }): Promise<{
+    vectors?: { id?: string }[];
+    pagination?: { next?: string };
+  }>;
+  deleteMany(ids: string[]): Promise<void>;
+  deleteAll(): Promise<void>;
+}
+
+export interface VectorIndex {
+  namespace(name: string): VectorNamespace;
+  describeIndexStats(): Promise<{ namespaces?: Record<string, { recordCount: number }> }>;
+}
+
+export type Embedder = (text: string) => Promise<number[]>;
+
+// Overrides for running the pipeline without Pinecone/OpenAI (e.g. offline replay)
+export interface PineconeServiceOptions {
+  index?: VectorIndex;
+  embedder?: Embedder;
+  chunkSize?: number;
 }
 
 export class PineconeService {
   private pinecone: Pinecone;
   private openai: OpenAI;
   private indexName: string;
+  private index: VectorIndex;
+  private embedder: Embedder;
+  private chunkSize: number;
 
-  constructor(apiKey: string, indexName: string, openaiKey: string) {
+  constructor(apiKey: string, indexName: string, openaiKey: string, options: PineconeServiceOptions = {}) {
     this.pinecone = new Pinecone({ apiKey });
     this.openai = new OpenAI({ 
       apiKey: openaiKey,
       baseURL: process.env.OPENAI_BASE_URL || 'https://api.emergent.sh/openai/v1'
     });
     this.indexName = indexName;
+    this.index = options.index || this.pinecone.index(indexName);
+    this.embedder = options.embedder || (text => this.generateEmbedding(text));
+    this.chunkSize = options.chunkSize || 2000;
+  }
+
+  // Each customer's vectors live in their own namespace, so queries and
+  // deletes only touch that tenant's data
+  static namespaceFor(customerId: string): string {
+    return `customer-${customerId}`;
+  }
+
+  private customerIndex(customerId: string) {
+    return this.index.namespace(PineconeService.namespaceFor(customerId));
   }
 
   // Chunk text into smaller pieces (roughly 500 tokens each)
-  private chunkText(text: string, chunkSize: number = 2000): string[] {
+  private chunkText(text: string, chunkSize: number = this.chunkSize): string[] {
     const chunks: string[] = [];
     const sentences = text.split(/[.!?]+/);
     let currentChunk = '';
@@ -80,7 +131,7 @@ export class PineconeService {
   ): Promise<void> {
     try {
       const chunks = this.chunkText(content);
-      const index = this.pinecone.index(this.indexName);
+      const index = this.customerIndex(customerId);
 
       console.log(`Upserting ${chunks.length} chunks for file ${filename}`);
 
@@ -90,7 +141,7 @@ export class PineconeService {
         const batchChunks = chunks.slice(i, i + batchSize);
         const vectors = await Promise.all(
           batchChunks.map(async (chunk, idx) => {
-            const embedding = await this.generateEmbedding(chunk);
+            const embedding = await this.embedder(chunk);
             return {
               id: `${fileId}-chunk-${i + idx}`,
               values: embedding,
@@ -125,7 +176,7 @@ export class PineconeService {
   ): Promise<void> {
     try {
       const chunks = this.chunkText(content);
-      const index = this.pinecone.index(this.indexName);
+      const index = this.customerIndex(customerId);
 
       console.log(`Upserting ${chunks.length} chunks for URL ${url}`);
 
@@ -134,7 +185,7 @@ export class PineconeService {
         const batchChunks = chunks.slice(i, i + batchSize);
         const vectors = await Promise.all(
           batchChunks.map(async (chunk, idx) => {
-            const embedding = await this.generateEmbedding(chunk);
+            const embedding = await this.embedder(chunk);
             return {
               id: `${contentId}-chunk-${i + idx}`,
               values: embedding,
@@ -164,17 +215,21 @@ export class PineconeService {
     customerId: string,
     query: string,
     topK: number = 5
-  ): Promise<{ text: string; source: string }[]> {
+  ): Promise<ContextMatch[]> {
     try {
-      const queryEmbedding = await this.generateEmbedding(query);
-      const index = this.pinecone.index(this.indexName);
+      const embedStart = performance.now();
+      const queryEmbedding = await this.embedder(query);
+      retrievalMetrics.recordStage('embed', performance.now() - embedStart);
 
+      const index = this.customerIndex(customerId);
+
+      const queryStart = performance.now();
       const queryResponse = await index.query({
         vector: queryEmbedding,
         topK,
-        filter: { customer_id: customerId },
         includeMetadata: true
       });
+      retrievalMetrics.recordStage('vector_query', performance.now() - queryStart);
 
       const results = queryResponse.matches.map(match => {
         const metadata = match.metadata as VectorMetadata;
@@ -195,24 +250,69 @@ export class PineconeService {
     }
   }
 
-  // Delete vectors for a specific file
-  async deleteKnowledgeFile(fileId: string): Promise<void> {
-    try {
-      const index = this.pinecone.index(this.indexName);
-      
-      // Delete all chunks for this file
-      // Note: Pinecone deleteMany with prefix filter
-      await index.deleteMany({
-        filter: { file_id: fileId }
+  // Delete all chunk vectors whose IDs start with `${sourceId}-chunk-`
+  private async deleteChunks(customerId: string, sourceId: string): Promise<number> {
+    const index = this.customerIndex(customerId);
+
+    // List every ID first so deletes can't disturb pagination
+    const ids: string[] = [];
+    let paginationToken: string | undefined;
+    do {
+      const page = await index.listPaginated({
+        prefix: `${sourceId}-chunk-`,
+        limit: 100,
+        paginationToken
       });
+      ids.push(...(page.vectors || []).map(v => v.id).filter((id): id is string => !!id));
+      paginationToken = page.pagination?.next;
+    } while (paginationToken);
+
+    for (let i = 0; i < ids.length; i += 100) {
+      await index.deleteMany(ids.slice(i, i + 100));
+    }
 
-      console.log(`Deleted vectors for file ${fileId}`);
+    return ids.length;
+  }
+
+  // Delete vectors for a specific file
+  async deleteKnowledgeFile(fileId: string, customerId: string): Promise<void> {
+    try {
+      const deleted = await this.deleteChunks(customerId, fileId);
+      console.log(`Deleted ${deleted} vectors for file ${fileId}`);
     } catch (error) {
       console.error('Error deleting from Pinecone:', error);
       throw error;
     }
   }
 
+  // Delete vectors for a scraped page
+  async deleteScrapedContent(contentId: string, customerId: string): Promise<void> {
+    try {
+      const deleted = await this.deleteChunks(customerId, contentId);
+      console.log(`Deleted ${deleted} vectors for scraped content ${contentId}`);
+    } catch (error) {
+      console.error('Error deleting scraped content from Pinecone:', error);
+      throw error;
+    }
+  }
+
+  // Purge every vector belonging to a customer
+  async deleteCustomer(customerId: string): Promise<void> {
+    try {
+      await this.customerIndex(customerId).deleteAll();
+      console.log(`Deleted namespace for customer ${customerId}`);
+    } catch (error) {
+      console.error('Error deleting customer namespace from Pinecone:', error);
+      throw error;
+    }
+  }
+
+  // Number of vectors stored for a customer
+  async getVectorCount(customerId: string): Promise<number> {
+    const stats = await this.index.describeIndexStats();
+    return stats.namespaces?.[PineconeService.namespaceFor(customerId)]?.recordCount || 0;
+  }
+
   // Initialize Pinecone index if it doesn't exist
   async initializeIndex(dimension: number = 1536): Promise<void> {
     try {
@@ -0,0 +1,246 @@
+import { numberFromEnv } from '../config/env';
+import { ContextMatch } from './pineconeService';
+import { retrievalMetrics } from './retrievalMetrics';
+
+// A re-ranking strategy scores all candidates for a query in one call and
+// returns the best topN. Implementations can be lexical, diversity-based or
+// backed by a local cross-encoder model. `deadline` is a performance.now()
+// timestamp; implementations should throw RerankBudgetExceeded once it passes.
+export interface Reranker {
+  readonly name: string;
+  rerank(query: string, candidates: ContextMatch[], topN: number, deadline: number): Promise<ContextMatch[]>;
+}
+
+export class RerankBudgetExceeded extends Error {
+  constructor() {
+    super('Rerank latency budget exceeded');
+    this.name = 'RerankBudgetExceeded';
+  }
+}
+
+// Scoring is synchronous, so a timer can never interrupt it; loops check this instead
+function checkDeadline(deadline: number): void {
+  if (performance.now() > deadline) {
+    throw new RerankBudgetExceeded();
+  }
+}
+
+const STOPWORDS = new Set([
+  'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'do', 'does', 'for', 'from',
+  'how', 'i', 'in', 'is', 'it', 'me', 'my', 'of', 'on', 'or', 'our', 'that', 'the',
+  'this', 'to', 'was', 'we', 'what', 'when', 'where', 'which', 'who', 'why', 'with',
+  'you', 'your'
+]);
+
+function tokenize(text: string): string[] {
+  return text
+    .toLowerCase()
+    .split(/[^\p{L}\p{N}]+/u)
+    .filter(token => token.length > 1 && !STOPWORDS.has(token));
+}
+
+// Scale scores to [0, 1] so vector and lexical scores can be blended
+function normalize(scores: number[]): number[] {
+  const min = Math.min(...scores);
+  const max = Math.max(...scores);
+  if (max === min) {
+    return scores.map(() => (max > 0 ? 1 : 0));
+  }
+  return scores.map(score => (score - min) / (max - min));
+}
+
+function jaccard(a: Set<string>, b: Set<string>): number {
+  if (a.size === 0 || b.size === 0) return 0;
+  let overlap = 0;
+  for (const token of a) {
+    if (b.has(token)) overlap++;
+  }
+  return overlap / (a.size + b.size - overlap);
+}
+
+// Passthrough: keeps Pinecone's order
+export class NoopReranker implements Reranker {
+  readonly name = 'none';
+
+  async rerank(query: string, candidates: ContextMatch[], topN: number, deadline: number): Promise<ContextMatch[]> {
+    return candidates.slice(0, topN);
+  }
+}
+
+// BM25 over the candidate set, blended with the vector similarity score
+export class LexicalReranker implements Reranker {
+  readonly name: string = 'lexical';
+
+  constructor(
+    protected vectorWeight: number = 0.5,
+    private k1: number = 1.2,
+    private b: number = 0.75
+  ) {}
+
+  // Relevance score per candidate, computed for the whole batch at once
+  protected score(query: string, docs: string[][], deadline: number): number[] {
+    const queryTerms = [...new Set(tokenize(query))];
+    const avgLength = docs.reduce((sum, doc) => sum + doc.length, 0) / (docs.length || 1);
+
+    const termCounts = docs.map(doc => {
+      const counts = new Map<string, number>();
+      for (const token of doc) {
+        counts.set(token, (counts.get(token) || 0) + 1);
+      }
+      return counts;
+    });
+
+    const idf = new Map<string, number>();
+    for (const term of queryTerms) {
+      const df = termCounts.filter(counts => counts.has(term)).length;
+      idf.set(term, Math.log(1 + (docs.length - df + 0.5) / (df + 0.5)));
+    }
+
+    return termCounts.map((counts, idx) => {
+      checkDeadline(deadline);
+      const lengthNorm = 1 - this.b + this.b * (docs[idx].length / (avgLength || 1));
+      return queryTerms.reduce((total, term) => {
+        const tf = counts.get(term) || 0;
+        if (tf === 0) return total;
+        return total + (idf.get(term) || 0) * (tf * (this.k1 + 1)) / (tf + this.k1 * lengthNorm);
+      }, 0);
+    });
+  }
+
+  protected relevance(query: string, candidates: ContextMatch[], docs: string[][], deadline: number): number[] {
+    const lexical = normalize(this.score(query, docs, deadline));
+    const vector = normalize(candidates.map(c => c.score));
+    return lexical.map((score, idx) =>
+      this.vectorWeight * vector[idx] + (1 - this.vectorWeight) * score
+    );
+  }
+
+  async rerank(query: string, candidates: ContextMatch[], topN: number, deadline: number): Promise<ContextMatch[]> {
+    if (candidates.length === 0) return [];
+
+    const docs = candidates.map(c => {
+      checkDeadline(deadline);
+      return tokenize(c.text);
+    });
+    const relevance = this.relevance(query, candidates, docs, deadline);
+
+    return candidates
+      .map((candidate, idx) => ({ candidate, score: relevance[idx] }))
+      .sort((a, b) => b.score - a.score)
+      .slice(0, topN)
+      .map(({ candidate }) => candidate);
+  }
+}
+
+// Maximal marginal relevance: trades relevance against overlap with chunks
+// already selected, so near-duplicate chunks do not crowd out the prompt
+export class MmrReranker extends LexicalReranker {
+  readonly name = 'mmr';
+
+  constructor(private lambda: number = 0.7, vectorWeight: number = 0.5) {
+    super(vectorWeight);
+  }
+
+  async rerank(query: string, candidates: ContextMatch[], topN: number, deadline: number): Promise<ContextMatch[]> {
+    if (candidates.length === 0) return [];
+
+    const docs = candidates.map(c => {
+      checkDeadline(deadline);
+      return tokenize(c.text);
+    });
+    const tokenSets = docs.map(doc => new Set(doc));
+    const relevance = this.relevance(query, candidates, docs, deadline);
+
+    const selected: number[] = [];
+    const remaining = new Set(candidates.map((_, idx) => idx));
+
+    while (selected.length < topN && remaining.size > 0) {
+      let best = -1;
+      let bestScore = -Infinity;
+
+      for (const idx of remaining) {
+        checkDeadline(deadline);
+        const redundancy = selected.reduce(
+          (max, sel) => Math.max(max, jaccard(tokenSets[idx], tokenSets[sel])),
+          0
+        );
+        const score = this.lambda * relevance[idx] - (1 - this.lambda) * redundancy;
+        if (score > bestScore) {
+          bestScore = score;
+          best = idx;
+        }
+      }
+
+      selected.push(best);
+      remaining.delete(best);
+    }
+
+    return selected.map(idx => candidates[idx]);
+  }
+}
+
+export function createReranker(strategy: string = process.env.RERANK_STRATEGY || 'mmr'): Reranker {
+  switch (strategy) {
+    case 'none':
+      return new NoopReranker();
+    case 'lexical':
+      return new LexicalReranker();
+    case 'mmr':
+      return new MmrReranker(numberFromEnv('RERANK_MMR_LAMBDA', 0.7, lambda => lambda >= 0 && lambda <= 1));
+    default:
+      console.warn(`Unknown RERANK_STRATEGY "${strategy}", using raw vector order`);
+      return new NoopReranker();
+  }
+}
+
+// Run a reranker within a latency budget. If it errors, runs out of budget
+// or returns late, the raw vector order is used instead.
+export async function rerankWithBudget(
+  reranker: Reranker,
+  query: string,
+  candidates: ContextMatch[],
+  topN: number,
+  budgetMs: number
+): Promise<ContextMatch[]> {
+  const rawTop = candidates.slice(0, topN);
+  const start = performance.now();
+  const deadline = start + budgetMs;
+  let fallback = false;
+  let results = rawTop;
+
+  // Also race a timer, for rerankers that await I/O (e.g. a model server)
+  let timer: NodeJS.Timeout | undefined;
+  const timeout = new Promise<null>(resolve => {
+    timer = setTimeout(() => resolve(null), budgetMs);
+  });
+
+  try {
+    const reranked = await Promise.race([reranker.rerank(query, candidates, topN, deadline), timeout]);
+    if (reranked && performance.now() - start <= budgetMs) {
+      results = reranked;
+    } else {
+      fallback = true;
+      console.warn(`Reranker ${reranker.name} exceeded ${budgetMs}ms budget, using raw order`);
+    }
+  } catch (error) {
+    fallback = true;
+    if (error instanceof RerankBudgetExceeded) {
+      console.warn(`Reranker ${reranker.name} exceeded ${budgetMs}ms budget, using raw order`);
+    } else {
+      console.error(`Reranker ${reranker.name} failed, using raw order:`, error);
+    }
+  } finally {
+    clearTimeout(timer);
+  }
+
+  retrievalMetrics.recordStage('rerank', performance.now() - start);
+  const rawSet = new Set(rawTop);
+  retrievalMetrics.recordRerank({
+    candidates: candidates.length,
+    returned: results.length,
+    promoted: results.filter(r => !rawSet.has(r)).length,
+    fallback
+  });
+
+  return results;
+}
@@ -0,0 +1,100 @@
+// In-process counters and timings for the retrieval pipeline, used to tune
+// candidate counts and topK against latency.
+
+const MAX_SAMPLES = 500;
+
+export type RetrievalStage = 'embed' | 'vector_query' | 'rerank' | 'total';
+
+export interface StageSummary {
+  count: number;
+  avg_ms: number;
+  p50_ms: number;
+  p95_ms: number;
+  max_ms: number;
+}
+
+export function summarizeDurations(values: number[]): StageSummary {
+  const sorted = [...values].sort((a, b) => a - b);
+  const percentile = (p: number) =>
+    sorted[Math.min(sorted.length - 1, Math.floor((p / 100) * sorted.length))];
+
+  return {
+    count: sorted.length,
+    avg_ms: sorted.reduce((sum, v) => sum + v, 0) / sorted.length,
+    p50_ms: percentile(50),
+    p95_ms: percentile(95),
+    max_ms: sorted[sorted.length - 1]
+  };
+}
+
+export interface RerankOutcome {
+  candidates: number;
+  returned: number;
+  // How many returned chunks were outside the raw vector top-K
+  promoted: number;
+  fallback: boolean;
+}
+
+class RetrievalMetrics {
+  private samples = new Map<RetrievalStage, number[]>();
+  private queries = 0;
+  private emptyResults = 0;
+  private fallbacks = 0;
+  private returned = 0;
+  private promoted = 0;
+  private candidates = 0;
+
+  recordStage(stage: RetrievalStage, durationMs: number): void {
+    const values = this.samples.get(stage) || [];
+    values.push(durationMs);
+    if (values.length > MAX_SAMPLES) {
+      values.shift();
+    }
+    this.samples.set(stage, values);
+  }
+
+  recordRerank(outcome: RerankOutcome): void {
+    this.queries++;
+    this.candidates += outcome.candidates;
+    this.returned += outcome.returned;
+    this.promoted += outcome.promoted;
+    if (outcome.candidates === 0) {
+      this.emptyResults++;
+    }
+    if (outcome.fallback) {
+      this.fallbacks++;
+    }
+  }
+
+  snapshot() {
+    const stages: Partial<Record<RetrievalStage, StageSummary>> = {};
+    for (const [stage, values] of this.samples) {
+      if (values.length > 0) {
+        stages[stage] = summarizeDurations(values);
+      }
+    }
+
+    return {
+      queries: this.queries,
+      // Share of queries where the namespace returned any candidates at all.
+      // This is not a relevance measure; use the offline replay for that.
+      nonempty_rate: this.queries > 0 ? (this.queries - this.emptyResults) / this.queries : 0,
+      fallback_rate: this.queries > 0 ? this.fallbacks / this.queries : 0,
+      promotion_rate: this.returned > 0 ? this.promoted / this.returned : 0,
+      avg_candidates: this.queries > 0 ? this.candidates / this.queries : 0,
+      stages
+    };
+  }
+
+  reset(): void {
+    this.samples.clear();
+    this.queries = 0;
+    this.emptyResults = 0;
+    this.fallbacks = 0;
+    this.returned = 0;
+    this.promoted = 0;
+    this.candidates = 0;
+  }
+}
+
+export const retrievalMetrics = new RetrievalMetrics();
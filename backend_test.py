@@ -314,7 +314,7 @@ class AuthTestSuite:
                 result = self.make_request("GET", f"/stats/{self.customer_id}", token=self.admin_token)
                 if result["success"]:
                     stats = result["data"]
-                    expected_keys = ["knowledge_files", "scraped_pages", "conversations"]
+                    expected_keys = ["knowledge_files", "scraped_pages", "conversations", "vectors"]
                     if all(key in stats for key in expected_keys):
                         self.log_test("Admin Stats Access", True, "Admin can access customer stats")
                     else:
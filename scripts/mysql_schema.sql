@@ -38,18 +38,33 @@ CREATE TABLE IF NOT EXISTS users (
   INDEX idx_customer_id (customer_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Table: content_blobs
+-- Purpose: Content-addressed store of extracted text (SHA-256 -> brotli-compressed body)
+CREATE TABLE IF NOT EXISTS content_blobs (
+  hash CHAR(64) PRIMARY KEY,
+  encoding VARCHAR(16) NOT NULL DEFAULT 'br',
+  data MEDIUMBLOB NOT NULL,
+  original_size INT UNSIGNED NOT NULL,
+  compressed_size INT UNSIGNED NOT NULL,
+  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  INDEX idx_last_used_at (last_used_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 -- Table: knowledge_files
--- Purpose: Store uploaded knowledge base files with extracted text content
+-- Purpose: Store uploaded knowledge base files (extracted text lives in content_blobs)
 CREATE TABLE IF NOT EXISTS knowledge_files (
   id VARCHAR(36) PRIMARY KEY,
   customer_id VARCHAR(36) NOT NULL,
   filename VARCHAR(255) NOT NULL,
   file_type VARCHAR(50) NOT NULL,
-  content MEDIUMTEXT NOT NULL,
+  content_hash CHAR(64) NOT NULL,
   uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
   updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   FOREIGN KEY (customer_id) REFERENCES customers(id) ON DELETE CASCADE,
+  FOREIGN KEY (content_hash) REFERENCES content_blobs(hash),
   INDEX idx_customer_id (customer_id),
+  INDEX idx_content_hash (content_hash),
   INDEX idx_uploaded_at (uploaded_at),
   INDEX idx_customer_uploaded (customer_id, uploaded_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -60,11 +75,13 @@ CREATE TABLE IF NOT EXISTS scraped_contents (
   id VARCHAR(36) PRIMARY KEY,
   customer_id VARCHAR(36) NOT NULL,
   url VARCHAR(1024) NOT NULL,
-  content MEDIUMTEXT NOT NULL,
+  content_hash CHAR(64) NOT NULL,
   scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
   updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   FOREIGN KEY (customer_id) REFERENCES customers(id) ON DELETE CASCADE,
+  FOREIGN KEY (content_hash) REFERENCES content_blobs(hash),
   INDEX idx_customer_id (customer_id),
+  INDEX idx_content_hash (content_hash),
   INDEX idx_url (url(255)),
   INDEX idx_scraped_at (scraped_at),
   INDEX idx_customer_url (customer_id, url(255)),